@@ -74,11 +74,14 @@
 
 import sys
 import os
+import re
+import copy
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-import textwrap
-
-import argparse
+from functools import lru_cache, partial
+from itertools import chain
+from types import MappingProxyType
 
 # Centralized mapping: all language-related data in a single dictionary
 language_info = {
@@ -90,6 +93,7 @@ language_info = {
     'P': {"name": "Python",    "comment": '#',    "lang": 'python'}
 }
 
+@lru_cache(maxsize=None)
 def get_language_info(code: str, info_type: str = "comment") -> str:
     """
     Retrieves language-related information based on the provided language code.
@@ -153,20 +157,25 @@ def get_language_info(code: str, info_type: str = "comment") -> str:
 #-------------------------------
 # Define tokens for each language
 #-------------------------------
+@lru_cache(maxsize=None)
 def get_language_tokens(lang):
     """Returns a dictionary of tokens for the specified language, based solely on the comment symbol.
 
+    The dictionary is built once per language and cached; a read-only view is returned so
+    that callers cannot modify the shared instance.
+
     Args:
         lang (str): Language code ('F' for Fortran90, 'A' for Ada, 'C' for C++, 'S' for Shell, G for GrADS).
 
     Returns:
-        dict: Dictionary with all token strings generated using the language-specific comment symbol.
+        MappingProxyType: Read-only mapping with all token strings generated using the
+                          language-specific comment symbol.
     """
 
     symbol = get_language_info(lang,"comment")
     
     # Build and return the tokens dictionary using the comment symbol.
-    return {
+    return MappingProxyType({
         "comment": symbol,
         "bop": symbol + "BOP",
         "eop": symbol + "EOP",
@@ -183,18 +192,233 @@ def get_language_tokens(lang):
         "iiro": symbol + "IIROUTINE:",
         "cro": symbol + "CROUTINE:",
         "program": symbol + "PROGRAM:"
-    }
+    })
+
+
+#-------------------------------
+# Precompiled marker scanners
+#-------------------------------
+def compile_marker_re(lang):
+    """Builds the regular expression used to detect block markers for the specified language.
+
+    The pattern is anchored at the start of a (left-stripped) line and matches an optional
+    stand-alone comment symbol followed by one of the known block markers (e.g. "!BOP",
+    "! !EOC", "!QUOTE:"). The marker must be a whole whitespace-delimited token.
+
+    Args:
+        lang (str): Language code ('F' for Fortran90, 'A' for Ada, 'C' for C++, 'S' for Shell, G for GrADS).
+
+    Returns:
+        re.Pattern: Compiled pattern. Group 1 is the marker and group 2 the (optional) text after it.
+    """
+    tokens  = get_language_tokens(lang)
+    markers = [tokens[key] for key in ("bop", "eop", "boi", "eoi", "boc", "eoc", "boe", "eoe",
+                                       "bor", "eor", "bopi", "eopi")]
+    markers.append("!QUOTE:")
+
+    # Longest markers first, so that e.g. "!BOPI" is never shadowed by "!BOP".
+    alternation = "|".join(re.escape(m) for m in sorted(markers, key=len, reverse=True))
+    return re.compile(r"^(?:" + re.escape(tokens["comment"]) + r"\s+)?(" + alternation + r")(?:\s+(.*))?$")
+
+
+# Marker scanners for every supported language, compiled once at import time.
+MARKER_RE = {code: compile_marker_re(code) for code in language_info}
+
+
+@lru_cache(maxsize=None)
+def compile_keys(keys):
+    """Builds a regular expression that finds any of the optional keyword markers in a line.
+
+    A single search replaces one substring test per keyword for the many prologue lines
+    that hold none of them. The pattern is built once per list of keywords and cached.
+
+    Args:
+        keys (tuple of str): The optional keyword markers (e.g. "!INTERFACE:").
+
+    Returns:
+        re.Pattern: Compiled pattern matching any of the keywords (never matching if the
+                    list is empty).
+    """
+    if not keys:
+        return re.compile(r"(?!)")
+    return re.compile("|".join(re.escape(key) for key in keys))
+
+
+#-------------------------------
+# Buffered input
+#-------------------------------
+# Buffer size (and readlines size hint) used when reading source files.
+READ_BUFFER_SIZE = 1 << 20
+
+def open_source_file(filename):
+    """Opens a source file for reading with a large buffer.
+
+    On platforms that support it, the kernel is also advised that the file will be read
+    sequentially, so that it can use a larger readahead window.
+
+    Args:
+        filename (str): Path of the source file.
+
+    Returns:
+        file object: The open text file.
+    """
+    f = open(filename, 'r', buffering=READ_BUFFER_SIZE)
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass  # Not a regular file (e.g. a pipe); the hint is optional anyway.
+    return f
+
+
+def open_stdin():
+    """Opens standard input for reading with a large buffer.
+
+    The file descriptor of `sys.stdin` is reopened (and left open afterwards) with the
+    same encoding, error handler and newline handling, but with a buffer of
+    `READ_BUFFER_SIZE` bytes instead of 8 KiB.
+
+    Returns:
+        file object: A text file reading standard input, or `sys.stdin` itself when it is
+                     not backed by a file descriptor.
+    """
+    try:
+        fd = sys.stdin.fileno()
+    except (AttributeError, OSError, ValueError):
+        return sys.stdin
+    return open(fd, 'r', buffering=READ_BUFFER_SIZE, encoding=sys.stdin.encoding,
+                errors=sys.stdin.errors, newline=None if os.name == "nt" else "\n",
+                closefd=False)
+
+
+#-------------------------------
+# Buffered output
+#-------------------------------
+# All LaTeX output is collected here, one line per item, and written to stdout in large
+# blocks joined with newlines.
+_OUT = []
+
+# Appends a line of LaTeX output (without its newline) to the output buffer.
+emit = _OUT.append
+
+
+def write_bytes(data):
+    """Writes already encoded output straight to the binary layer of stdout.
+
+    Falls back to the text layer when stdout has no binary buffer (e.g. when it has
+    been replaced by an in-memory text stream).
+
+    Args:
+        data (bytes): The encoded output.
+    """
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.write(data.decode(sys.stdout.encoding or "utf-8"))
+    else:
+        sys.stdout.flush()  # Keep ordering with anything written through the text layer.
+        buffer.write(data)
+
+
+def write_text(text):
+    """Encodes LaTeX output with the encoding of stdout and writes it out.
+
+    Args:
+        text (str): The output to write.
+    """
+    if text:
+        write_bytes(text.encode(sys.stdout.encoding or "utf-8", sys.stdout.errors or "strict"))
+
+
+# A minted environment with nothing in it, e.g. left by two consecutive keyword markers. It is
+# replaced by a blank line, which still ends the paragraph as the environment did. The pattern
+# starts with the preceding newline rather than "^", so that the regex engine can scan for its
+# literal prefix.
+_EMPTY_MINTED_RE = re.compile(r"\n\\begin\{minted\}[^\n]*\n\\end\{minted\}\n")
+
+
+def take_output():
+    """Returns the buffered LaTeX output and empties the buffer.
+
+    Empty minted environments are replaced by paragraph breaks on the way, which saves
+    LaTeX a call to Pygments for each of them.
+    """
+    if not _OUT:
+        return ""
+    _OUT.append("")  # Terminates the last line.
+    text = "\n".join(_OUT)
+    _OUT.clear()
+    return _EMPTY_MINTED_RE.sub("\n\n", text)
+
+
+def flush_output():
+    """Writes the buffered LaTeX output to stdout and empties the buffer."""
+    write_text(take_output())
 
 
 #-------------------------------
 # LaTeX preamble and macros
 #-------------------------------
+# Constant parts of the LaTeX header, written out as single blocks.
+_NOTICE = """%                **** IMPORTANT NOTICE *****
+% This LaTeX file was automatically generated by ProTeX (Python version)
+% Any changes made to this file will likely be lost next time
+% it is regenerated from its source. Send questions to joao.gerd@inpe.br
+
+"""
+
+_PREAMBLE_FIXED = r"""\usepackage{amsmath}
+\usepackage{epsfig}
+\usepackage{minted}
+\textheight     9in
+\topmargin      0pt
+\headsep        1cm
+\headheight     0pt
+\textwidth      6in
+\oddsidemargin  0in
+\evensidemargin 0in
+\marginparpush  0pt
+\pagestyle{myheadings}
+\markboth{}{}
+%-------------------------------------------------------------
+\setlength{\parskip}{0pt}
+\setlength{\parindent}{0pt}
+\setlength{\baselineskip}{11pt}
+"""
+
+_MACROS = r"""
+%--------------------- SHORT-HAND MACROS ----------------------
+\def\be{\begin{equation}}
+\def\ee{\end{equation}}
+\def\bea{\begin{eqnarray}}
+\def\eea{\end{eqnarray}}
+\def\bi{\begin{itemize}}
+\def\ei{\end{itemize}}
+\def\bn{\begin{enumerate}}
+\def\en{\end{enumerate}}
+\def\bd{\begin{description}}
+\def\ed{\end{description}}
+\def\({\left (}
+\def\){\right )}
+\def\[{\left [}
+\def\]{\right ]}
+\def\<{\left \langle}
+\def\>{\right \rangle}
+\def\cI{{\cal I}}
+\def\diag{\mathop{\rm diag}}
+\def\tr{\mathop{\rm tr}}
+%-------------------------------------------------------------
+"""
+
+# The constant blocks are plain ASCII, so they are encoded once and bypass the text encoder.
+_NOTICE_BYTES         = _NOTICE.encode("ascii")
+_PREAMBLE_FIXED_BYTES = _PREAMBLE_FIXED.encode("ascii")
+_MACROS_BYTES         = _MACROS.encode("ascii")
+
+
 def print_notice():
     """Prints the notice header in the LaTeX document."""
-    print("%                **** IMPORTANT NOTICE *****")
-    print("% This LaTeX file was automatically generated by ProTeX (Python version)")
-    print("% Any changes made to this file will likely be lost next time")
-    print("% it is regenerated from its source. Send questions to joao.gerd@inpe.br\n")
+    flush_output()
+    write_bytes(_NOTICE_BYTES)
 
 
 def print_preamble(custom_style=None):
@@ -205,61 +429,30 @@ def print_preamble(custom_style=None):
     Args:
         custom_style (str, optional): Custom document class or style.
     """
-    print("%------------------------ PREAMBLE --------------------------")
+    emit("%------------------------ PREAMBLE --------------------------")
     if custom_style:
-        print("\\documentclass[11pt]{" + custom_style + "}")
-        print("\\usepackage{" + custom_style + "}")
+        emit("\\documentclass[11pt]{" + custom_style + "}")
+        emit("\\usepackage{" + custom_style + "}")
     else:
-        print("\\documentclass[11pt]{article}")
-
-    print("\\usepackage{amsmath}")
-    print("\\usepackage{epsfig}")
-    print("\\usepackage{minted}")
-
-    print("\\textheight     9in")
-    print("\\topmargin      0pt")
-    print("\\headsep        1cm")
-    print("\\headheight     0pt")
-    print("\\textwidth      6in")
-    print("\\oddsidemargin  0in")
-    print("\\evensidemargin 0in")
-    print("\\marginparpush  0pt")
-    print("\\pagestyle{myheadings}")
-    print("\\markboth{}{}")
-    print("%-------------------------------------------------------------")
-    print("\\setlength{\\parskip}{0pt}")
-    print("\\setlength{\\parindent}{0pt}")
-    print("\\setlength{\\baselineskip}{11pt}")
+        emit("\\documentclass[11pt]{article}")
+
+    flush_output()
+    write_bytes(_PREAMBLE_FIXED_BYTES)
 
 
 def print_macros():
     """Prints LaTeX macros for shorthand commands."""
-    print("\n%--------------------- SHORT-HAND MACROS ----------------------")
-    print("\\def\\be{\\begin{equation}}")
-    print("\\def\\ee{\\end{equation}}")
-    print("\\def\\bea{\\begin{eqnarray}}")
-    print("\\def\\eea{\\end{eqnarray}}")
-    print("\\def\\bi{\\begin{itemize}}")
-    print("\\def\\ei{\\end{itemize}}")
-    print("\\def\\bn{\\begin{enumerate}}")
-    print("\\def\\en{\\end{enumerate}}")
-    print("\\def\\bd{\\begin{description}}")
-    print("\\def\\ed{\\end{description}}")
-    print("\\def\\({\\left (}")
-    print("\\def\\){\\right )}")
-    print("\\def\\[{\\left [}")
-    print("\\def\\]{\\right ]}")
-    print("\\def\\<{\\left \\langle}")
-    print("\\def\\>{\\right \\rangle}")
-    print("\\def\\cI{{\\cal I}}")
-    print("\\def\\diag{\\mathop{\\rm diag}}")
-    print("\\def\\tr{\\mathop{\\rm tr}}")
-    print("%-------------------------------------------------------------")
+    flush_output()
+    write_bytes(_MACROS_BYTES)
 
 
 #-------------------------------
 # New: Helper to process resource lines
 #-------------------------------
+_RES_ROW = ("\\makebox[1.0in][l]{{{0}}} & \\makebox[3.5in][l]{{{1}}} & "
+            "\\makebox[1.0in][l]{{{2}}} & \\makebox[1.0in][l]{{{3}}} \\\\\n\\hline")
+
+
 def process_resource_line(line):
     """Processes a resource line by splitting it by commas and printing a LaTeX table row.
 
@@ -269,15 +462,61 @@ def process_resource_line(line):
     Returns:
         None
     """
-    parts = [p.strip() for p in line.split(',')]
+    # Only the first four columns are printed; the fifth part collects anything beyond.
+    parts = line.split(',', 4)
     if len(parts) >= 4:
-        print("\\makebox[1.0in][l]{" + parts[0] + "} & " +
-              "\\makebox[3.5in][l]{" + parts[1] + "} & " +
-              "\\makebox[1.0in][l]{" + parts[2] + "} & " +
-              "\\makebox[1.0in][l]{" + parts[3] + "} \\\\")
-        print("\\hline")
+        emit(_RES_ROW.format(*[p.strip() for p in parts[:4]]))
     else:
-        print(line)
+        emit(line)
+
+
+#-------------------------------
+# Document state
+#-------------------------------
+class DocState:
+    """Global state of the document, shared by all processing functions.
+
+    The state is carried over from one source file to the next. Attributes are declared
+    in `__slots__`, which makes their access cheaper than dictionary lookups in the
+    per-line processing loop.
+    """
+    __slots__ = ("intro", "prologue", "first", "source", "verb", "tpage", "begdoc",
+                 "not_first", "have_name", "have_desc", "have_intf", "have_hist",
+                 "name_is", "title", "author", "affiliation", "doc_date", "resource")
+
+    def __init__(self):
+        self.intro       = False
+        self.prologue    = False
+        self.first       = True
+        self.source      = False
+        self.verb        = False
+        self.tpage       = False
+        self.begdoc      = False
+        self.not_first   = False
+        self.have_name   = False
+        self.have_desc   = False
+        self.have_intf   = False
+        self.have_hist   = False
+        self.name_is     = "UNKNOWN"
+        self.title       = ""
+        self.author      = ""
+        self.affiliation = ""
+        self.doc_date    = ""
+        self.resource    = False  # Flag for resource block
+
+    # Attributes that are recorded but never read back, so they do not affect the output.
+    # The parallel path (see `process_files_parallel`) leaves them out when it checks its
+    # guessed starting states: code that reads any of them must remove it from this list,
+    # or parallel runs may produce a different document than serial ones.
+    RECORD_ONLY = ("have_name", "have_desc", "have_intf", "have_hist", "name_is")
+
+    def output_key(self):
+        """Returns the values of the attributes that affect the output, in `__slots__` order.
+
+        Processing the same input from two states with equal keys gives the same output.
+        """
+        return tuple(getattr(self, name) for name in self.__slots__
+                     if name not in self.RECORD_ONLY)
 
 
 #-------------------------------
@@ -287,53 +526,53 @@ def do_beg(state, bare):
     """Begins the LaTeX document by printing title, TOC, etc.
 
     Args:
-        state (dict): Global document state.
+        state (DocState): Global document state.
         bare (bool): Bare mode flag.
     """
     if bare:
         return
         
-    if not state["begdoc"]:
-        if state["tpage"]:
-            print("\\title{" + state["title"] + "}")
-            print("\\author{{\\sc " + state["author"] + "}\\\\ {\\em " + state["affiliation"] + "}}")
-            print("\\date{" + state["doc_date"] + "}")
+    if not state.begdoc:
+        if state.tpage:
+            emit("\\title{" + state.title + "}")
+            emit("\\author{{\\sc " + state.author + "}\\\\ {\\em " + state.affiliation + "}}")
+            emit("\\date{" + state.doc_date + "}")
 
-        print("\\begin{document}")
-        if state["tpage"]:
-            print("\\maketitle")
+        emit("\\begin{document}")
+        if state.tpage:
+            emit("\\maketitle")
 
-        print("\\tableofcontents")
-        print("\\newpage")
+        emit("\\tableofcontents")
+        emit("\\newpage")
 
-        state["begdoc"] = True
+        state.begdoc = True
 
 def do_boc(state, lang_name):
     """Begin a verbatim/code block if active.
 
     Args:
-        state (dict): Global document state.
+        state (DocState): Global document state.
     """
-    print("\n %------------------ START CODE ------------------%")
-    state["first"]    = False
-    state["prologue"] = False
-    state["source"]   = True
-    state["verb"]     = True
-    print(f"\\begin{{minted}}[breaklines,breakafter=-+*/&]{{{lang_name}}}")
+    emit("\n %------------------ START CODE ------------------%")
+    state.first    = False
+    state.prologue = False
+    state.source   = True
+    state.verb     = True
+    emit(f"\\begin{{minted}}[breaklines,breakafter=-+*/&]{{{lang_name}}}")
 
 
 def do_eoc(state):
     """Ends a verbatim/code block if active.
 
     Args:
-        state (dict): Global document state.
+        state (DocState): Global document state.
     """
-    if state["verb"]:
-        print("\\end{minted}")
-        state["verb"] = False
+    if state.verb:
+        emit("\\end{minted}")
+        state.verb = False
         
-    state["source"] = False
-    print("\n %------------------ END CODE ------------------%")
+    state.source = False
+    emit("\n %------------------ END CODE ------------------%")
 
 
 
@@ -341,13 +580,143 @@ def set_missing(state):
     """Resets required prologue markers.
 
     Args:
-        state (dict): Global document state.
+        state (DocState): Global document state.
+    """
+    # Record-only attributes: reading any of them makes the parallel path wrong unless
+    # it is removed from DocState.RECORD_ONLY.
+    state.have_name = False
+    state.have_desc = False
+    state.have_intf = False
+    state.have_hist = False
+    state.name_is = "UNKNOWN"
+
+
+def do_boi(state):
+    """Begins the introduction (!BOI).
+
+    Args:
+        state (DocState): Global document state.
+    """
+    state.intro = True
+
+
+def do_eoi(state):
+    """Ends the introduction (!EOI).
+
+    Args:
+        state (DocState): Global document state.
+    """
+    emit("\n %/////////////////////////////////////////////////////////////")
+    emit("\\newpage")
+    state.intro = False
+
+
+def do_bor(state):
+    """Begins a resource block (!BOR) by printing the header of the resource table.
+
+    Args:
+        state (DocState): Global document state.
+    """
+    emit("\\begin{center}")
+    emit("{\\bf RESOURCES:}\\\\")
+    emit("\\begin{tabular}{|l|l|l|l|}")
+    emit("\\hline")
+    emit("\\textbf{Name} & \\textbf{Description} & \\textbf{Units} & \\textbf{Default} \\\\")
+    emit("\\hline")
+    emit("\\end{tabular}")
+    emit("\\end{center}")
+    state.resource = True
+
+
+def do_bop(state, opts):
+    """Begins a prologue (!BOP), closing any open code block first.
+
+    Args:
+        state (DocState): Global document state.
+        opts (Namespace): Command-line options.
+    """
+    if state.source:
+        do_eoc(state)
+        
+    do_beg(state, opts.bare)
+
+    if not state.first:
+        emit("\n\\mbox{}\\hrulefill\\")
+    else:
+        if not opts.bare and not (opts.g or opts.M):
+            emit("\\section{Routine/Function Prologues} \\label{app:ProLogues}")
+
+    state.first    = False
+    state.prologue = True
+    state.verb     = False
+    state.source   = False
+    set_missing(state)
+
+
+def do_bopi(state, opts):
+    """Begins an internal prologue (!BOPI), which is omitted in internal mode.
+
+    Args:
+        state (DocState): Global document state.
+        opts (Namespace): Command-line options.
+    """
+    if opts.internal:
+        state.prologue = False
+    else:
+        do_bop(state, opts)
+
+
+def do_eop(state):
+    """Ends a prologue (!EOP, !EOPI) or an example prologue (!EOE).
+
+    Args:
+        state (DocState): Global document state.
+    """
+    if state.verb:
+        emit("\\end{minted}")
+        state.verb = False
+    state.prologue = False
+
+
+def do_boe(state):
+    """Begins an example prologue (!BOE), closing any open code block.
+
+    Args:
+        state (DocState): Global document state.
+    """
+    if state.source:
+        do_eoc(state)
+
+    emit("\n %/////////////////////////////////////////////////////////////")
+    state.first    = False
+    state.prologue = True
+    state.verb     = False
+    state.source   = False
+
+
+def do_introduction(text, state, opts):
+    """Begins the document (if needed) and prints the introduction section (!INTRODUCTION:).
+
+    Args:
+        text (str): Text of the introduction line, starting at the marker.
+        state (DocState): Global document state.
+        opts (Namespace): Command-line options.
+    """
+    do_beg(state, opts.bare)
+    emit(" %..............................................")
+    emit("\\section{" + text + "}")
+
+
+def set_title_info(state, key, text):
+    """Stores a title page entry (!TITLE:, !AUTHORS:, !AFFILIATION: or !DATE:).
+
+    Args:
+        state (DocState): Global document state.
+        key (str): The state attribute to set (e.g. "title").
+        text (str): Text of the introduction line, starting at the marker.
     """
-    state["have_name"] = False
-    state["have_desc"] = False
-    state["have_intf"] = False
-    state["have_hist"] = False
-    state["name_is"] = "UNKNOWN"
+    setattr(state, key, text)
+    state.tpage = True
 
 
 #-------------------------------
@@ -379,34 +748,32 @@ def get_format(fmt, remove_source):
         return fmt.replace(" (Source File: %s)", "")
     return fmt
 
-def get_format(fmt, remove_source):
+
+def split_template(fmt, file_basename):
     """
-    Adjusts a LaTeX format string based on the user's option to remove source file references.
-    
-    This function checks whether the user has opted to remove the '(Source File: %s)' part
-    from the LaTeX formatting string. If removal is requested, the function modifies the 
-    format string accordingly; otherwise, it returns the original string unchanged.
+    Splits a LaTeX format string around its content placeholder, filling in the source file.
+
+    The format string is specialized once per source file: the file name (second
+    placeholder, if any) is substituted here, so that only the content remains to be
+    placed between the two literal parts for every marker.
 
     Args:
-        fmt (str): The original LaTeX format string, which may contain '(Source File: %s)'.
-        remove_source (bool): Flag indicating whether to remove the source file reference.
+        fmt (str): A LaTeX format string with a '%s' placeholder for the content and,
+                   optionally, a second one for the source file name.
+        file_basename (str): The formatted source file name.
 
     Returns:
-        str: The modified or original format string, depending on the value of `remove_source`.
+        tuple of str: The literal text before and after the content.
 
     Example:
-        >>> get_format("\\subsection{Fortran: Module Interface %s (Source File: %s)}\n", True)
-        '\\subsection{Fortran: Module Interface %s }\n'
-        
-        >>> get_format("\\subsubsection{%s (Source File: %s)}\n", False)
-        '\\subsubsection{%s (Source File: %s)}\n'
+        >>> split_template("\\subsubsection{%s (Source File: %s)}\n", "m\\_time.f90")
+        ('\\subsubsection{', ' (Source File: m\\_time.f90)}\n')
     """
-    if remove_source:
-        return fmt.replace(" (Source File: %s)", "")
-    return fmt
+    prefix, suffix = fmt.split("%s", 1)
+    return prefix, suffix.replace("%s", file_basename)
 
 
-def get_prologue_processors(opts):
+def get_prologue_processors(opts, file_basename):
     """
     Creates a dictionary of processing functions for different Fortran documentation markers.
 
@@ -420,6 +787,7 @@ def get_prologue_processors(opts):
     Args:
         opts (Namespace): Command-line options containing the `f` flag, which determines
                           whether to exclude '(Source File: %s)' from the LaTeX output.
+        file_basename (str): The formatted name of the source file being processed.
 
     Returns:
         dict: A dictionary mapping documentation markers to processing functions.
@@ -428,7 +796,7 @@ def get_prologue_processors(opts):
         >>> class Opts:
         ...     f = True
         >>> opts = Opts()
-        >>> prologue_processors = get_prologue_processors(opts)
+        >>> prologue_processors = get_prologue_processors(opts, "m\\_time.f90")
         >>> print(prologue_processors["!MODULE:"])  # Function reference
 
     Notes:
@@ -439,27 +807,17 @@ def get_prologue_processors(opts):
     """
     remove_source = getattr(opts, 'f', False)
 
+    # Templates are adjusted and specialized for the file once here, so process_generic
+    # can use them as they are.
+    module_template  = get_format("\\subsection{Fortran: Module Interface %s (Source File: %s)}\n", remove_source)
+    program_template = get_format("\\subsection{Fortran: Main Program %s (Source File: %s)}\n", remove_source)
+    routine_template = get_format("\\subsubsection{%s (Source File: %s)}\n", remove_source)
+
     return {
-        "!MODULE:": lambda fields, fb, opts, state: process_generic(
-            fields,
-            get_format("\\subsection{Fortran: Module Interface %s (Source File: %s)}\n", remove_source),
-            fb, opts, state
-        ),
-        "!PROGRAM:": lambda fields, fb, opts, state: process_generic(
-            fields,
-            get_format("\\subsection{Fortran: Main Program %s (Source File: %s)}\n", remove_source),
-            fb, opts, state
-        ),
-        "!ROUTINE:": lambda fields, fb, opts, state: process_generic(
-            fields,
-            get_format("\\subsubsection{%s (Source File: %s)}\n", remove_source),
-            fb, opts, state
-        ),
-        "!FUNCTION:": lambda fields, fb, opts, state: process_generic(
-            fields,
-            "\\subsubsection{%s (Source File: %s)}\n",  # Maintains source file reference
-            fb, opts, state
-        ),
+        "!MODULE:": partial(process_generic, split_template(module_template, file_basename)),
+        "!PROGRAM:": partial(process_generic, split_template(program_template, file_basename)),
+        "!ROUTINE:": partial(process_generic, split_template(routine_template, file_basename)),
+        "!FUNCTION:": partial(process_generic, split_template(routine_template, file_basename)),
         "!IROUTINE:": process_internal,
         "!IFUNCTION:": process_internal,
         "!IIROUTINE:": process_overloaded,
@@ -467,128 +825,206 @@ def get_prologue_processors(opts):
     }
 
 
-def process_generic(fields, latex_template, file_basename, opts, state):
+def get_marker_handlers(tokens, opts):
+    """
+    Creates a dictionary of processing functions for the block markers that are recognized
+    anywhere in a source file (outside of resource blocks).
+
+    Each key is a marker as returned by the language's marker scanner (see `MARKER_RE`),
+    and each value is a function taking the text after the marker (or None) and the
+    document state.
+
+    Args:
+        tokens (dict): The dictionary of markup tokens.
+        opts (Namespace): Command-line options.
+
+    Returns:
+        dict: A dictionary mapping block markers to processing functions.
+    """
+    return {
+        "!QUOTE:":      lambda tail, state: emit(tail or ""),
+        tokens["boi"]:  lambda tail, state: do_boi(state),
+        tokens["eoi"]:  lambda tail, state: do_eoi(state),
+        tokens["bor"]:  lambda tail, state: do_bor(state),
+        tokens["bop"]:  lambda tail, state: do_bop(state, opts),
+        tokens["bopi"]: lambda tail, state: do_bopi(state, opts),
+    }
+
+
+def get_block_handlers(tokens, opts, lang_name):
+    """
+    Creates a dictionary of processing functions for the code block and example prologue
+    markers (!BOC, !EOC, !BOE, !EOE).
+
+    These markers are only handled after the prologue processing, so they are kept apart
+    from the handlers of `get_marker_handlers`.
+
+    Args:
+        tokens (dict): The dictionary of markup tokens.
+        opts (Namespace): Command-line options.
+        lang_name (str): The minted name of the source language.
+
+    Returns:
+        dict: A dictionary mapping block markers to functions taking the document state.
+    """
+    def begin_code(state):
+        # In shut-up mode the code is ignored.
+        if opts.s:
+            state.prologue = False
+        else:
+            do_boc(state, lang_name)
+
+    return {
+        tokens["boc"]: begin_code,
+        tokens["eoc"]: do_eoc,
+        tokens["boe"]: do_boe,
+        tokens["eoe"]: do_eop,
+    }
+
+
+def get_intro_processors(opts):
+    """
+    Creates a dictionary of processing functions for the markers of an introduction
+    (between !BOI and !EOI).
+
+    Args:
+        opts (Namespace): Command-line options.
+
+    Returns:
+        dict: A dictionary mapping introduction markers to functions taking the text of
+              the line (starting at the marker) and the document state.
+    """
+    return {
+        "!TITLE:":        lambda text, state: set_title_info(state, "title", text),
+        "!AUTHORS:":      lambda text, state: set_title_info(state, "author", text),
+        "!AFFILIATION:":  lambda text, state: set_title_info(state, "affiliation", text),
+        "!DATE:":         lambda text, state: set_title_info(state, "doc_date", text),
+        "!INTRODUCTION:": lambda text, state: do_introduction(text, state, opts),
+    }
+
+
+# Words that make an optional keyword label print in italics (anywhere in the line).
+_LABEL_WORDS_RE = re.compile(r"USES|INPUT|OUTPUT|PARAMETERS|VALUE|ARGUMENTS")
+
+# Translation table escaping underscores for LaTeX.
+_UNDERSCORE_TABLE = str.maketrans({"_": "\\_"})
+
+
+def process_generic(template_parts, tail, file_basename, opts, state):
     """Processes a generic prologue marker and prints the corresponding LaTeX output.
 
-    This function concatenates the remaining tokens in `fields` (which represent the content
-    after the marker), replaces underscores with "\_", and then formats that content using
-    the provided LaTeX template. The template should have two placeholders:
-      - The first for the content (e.g., a routine or module name).
-      - The second for the source file base name.
+    This function takes the text in `tail` (the content after the marker), replaces
+    underscores with "\_", and then places that content between the literal parts of
+    a LaTeX template (see `split_template`), which already include the source file
+    base name.
     
     Example:
-        If fields = ["MyModule"], file_basename = "m_time.f90", and
-        latex_template = "\\subsection{Fortran: Module Interface %s (Source File: %s)}\n",
+        If tail = "MyModule" and
+        template_parts = split_template("\\subsection{Fortran: Module Interface %s (Source File: %s)}\n", "m\\_time.f90"),
         the function will print:
         
           \subsection{Fortran: Module Interface MyModule (Source File: m\_time.f90)}
     
     Args:
-        fields (list of str): Tokens representing the content after the marker.
-        latex_template (str): A LaTeX template string with two %s placeholders.
-        file_basename (str): The formatted source file name.
+        template_parts (tuple of str): The literal text before and after the content.
+        tail (str): The content after the marker.
+        file_basename (str): The formatted source file name (already part of the template).
         opts (Namespace): Command-line options.
-        state (dict): Global document state.
+        state (DocState): Global document state.
     
     Side Effects:
-        Prints the formatted LaTeX output to stdout.
+        Emits the formatted LaTeX output to the output buffer.
     """
-    latex_template = get_format(latex_template, opts.f)
-    
-    content = " ".join(fields).replace("_", "\\_")
-    if opts.n and state.get("not_first", False):
-        print("\\newpage")
-    if not opts.f:
-        print(latex_template % (content, file_basename))
-    else:
-        # If file info is not to be printed, supply an empty string for the second placeholder.
-        print(latex_template % content)
-    state["have_name"] = True
-    state["not_first"] = True
+    content = tail.translate(_UNDERSCORE_TABLE)
+    if opts.n and state.not_first:
+        emit("\\newpage")
+    emit(template_parts[0] + content + template_parts[1])
+    state.have_name = True  # Record only (see DocState.RECORD_ONLY)
+    state.not_first = True
 
 
-def process_internal(fields, file_basename, opts, state):
+def process_internal(tail, file_basename, opts, state):
     """Processes an internal routine marker (!IROUTINE:) and prints a LaTeX section.
 
-    This function concatenates the tokens in `fields` (the content after the marker),
-    replaces underscores with "\_", and extracts a short label from the second word (if available).
+    This function takes the text in `tail` (the content after the marker), replaces
+    underscores with "\_", and extracts a short label from the second word (if available).
     It then prints a LaTeX subsubsection using the short label as an optional argument.
     
     Example:
-        If fields = ["Helper", "Routine"] then the function prints:
+        If tail = "Helper Routine" then the function prints:
         
           \subsubsection [Routine]{Helper Routine}
     
     Args:
-        fields (list of str): Tokens representing the content after the marker.
+        tail (str): The content after the marker.
         file_basename (str): The source file base name (not used in this function).
         opts (Namespace): Command-line options.
-        state (dict): Global document state.
+        state (DocState): Global document state.
     
     Side Effects:
         Prints the formatted LaTeX output for an internal routine.
     """
-    content = " ".join(fields).replace("_", "\\_")
-    words = content.split()
+    content = tail.translate(_UNDERSCORE_TABLE)
+    words = content.split(None, 2)
     short_label = words[1] if len(words) > 1 else ""
-    print("\\subsubsection [%s]{%s}\n" % (short_label, content))
-    state["have_name"] = True
+    emit("".join(("\\subsubsection [", short_label, "]{", content, "}\n")))
+    state.have_name = True  # Record only (see DocState.RECORD_ONLY)
 
 
-def process_overloaded(fields, file_basename, opts, state):
+def process_overloaded(tail, file_basename, opts, state):
     """Processes an overloaded routine marker (!IIROUTINE:) and prints a LaTeX section.
 
-    This function handles overloaded routines by concatenating the tokens in `fields`,
-    replacing underscores with "\_", and extracting a short label from the subsequent tokens.
+    This function handles overloaded routines by taking the text in `tail`, replacing
+    underscores with "\_", and extracting a short label from the subsequent words.
     It then prints a LaTeX subsubsection with the short label.
     
     Example:
-        If fields = ["Overload", "Variant1"] then the function prints:
+        If tail = "Overload Variant1" then the function prints:
         
           \subsubsection [Variant1]{Overload Variant1}
     
     Args:
-        fields (list of str): Tokens representing the content after the marker.
+        tail (str): The content after the marker.
         file_basename (str): The source file base name (not used here).
         opts (Namespace): Command-line options.
-        state (dict): Global document state.
+        state (DocState): Global document state.
     
     Side Effects:
         Prints the formatted LaTeX output for an overloaded routine.
     """
-    content = " ".join(fields).replace("_", "\\_")
-    words = content.split()
-    short_label = " ".join(words[1:]) if len(words) > 1 else ""
-    print("\\subsubsection [%s]{%s}\n" % (short_label, content))
-    state["have_name"] = True
+    content = tail.translate(_UNDERSCORE_TABLE)
+    words = content.split(None, 1)
+    short_label = words[1] if len(words) > 1 else ""
+    emit("".join(("\\subsubsection [", short_label, "]{", content, "}\n")))
+    state.have_name = True  # Record only (see DocState.RECORD_ONLY)
 
 
-def process_contained(fields, file_basename, opts, state):
+def process_contained(tail, file_basename, opts, state):
     """Processes a contained routine marker (!CROUTINE:) and prints a LaTeX section.
 
-    This function concatenates the tokens in `fields` (the content after the marker),
-    replaces underscores with "\_", and extracts a short label from the second word (if available).
+    This function takes the text in `tail` (the content after the marker), replaces
+    underscores with "\_", and extracts a short label from the second word (if available).
     It then prints a LaTeX subsubsection using the extracted label.
     
     Example:
-        If fields = ["Contained", "Routine"] then the function prints:
+        If tail = "Contained Routine" then the function prints:
         
           \subsubsection [Routine]{Contained Routine}
     
     Args:
-        fields (list of str): Tokens representing the content after the marker.
+        tail (str): The content after the marker.
         file_basename (str): The source file base name (not used here).
         opts (Namespace): Command-line options.
-        state (dict): Global document state.
+        state (DocState): Global document state.
     
     Side Effects:
         Prints the formatted LaTeX output for a contained routine.
     """
-    content = " ".join(fields).replace("_", "\\_")
-    words = content.split()
+    content = tail.translate(_UNDERSCORE_TABLE)
+    words = content.split(None, 2)
     short_label = words[1] if len(words) > 1 else ""
-    print("\\subsubsection [%s]{%s}\n" % (short_label, content))
-    state["have_name"] = True
+    emit("".join(("\\subsubsection [", short_label, "]{", content, "}\n")))
+    state.have_name = True  # Record only (see DocState.RECORD_ONLY)
 
 
 def process_file(f, filename, state, tokens, lang, opts):
@@ -601,282 +1037,283 @@ def process_file(f, filename, state, tokens, lang, opts):
     Args:
         f (file-like object): The open source file.
         filename (str): The name of the file (or '-' for STDIN).
-        state (dict): The global state of the document.
+        state (DocState): The global state of the document.
         tokens (dict): The dictionary of markup tokens.
         lang (str): Language code ('F' for Fortran90, 'A' for Ada, 'C' for C++, 'S' for Shell, G for GrADS)
         opts (Namespace): Command-line options.
 
     Side Effects:
-        Prints the corresponding LaTeX commands to stdout.
+        Emits the corresponding LaTeX commands to the output buffer (see `emit`).
     """
     file_basename = os.path.basename(filename) if filename != '-' else "Standard Input"
     file_basename = file_basename.replace("_", "\\_")
-    file_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    # All the files of a run share the date stamp set in main().
+    file_date = getattr(opts, 'run_date', None) or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     if not (opts.g or opts.M):
-        print("\n\\markboth{Left}{Source File: %s,  Date: %s}\n" % (file_basename, file_date))
+        emit("\n\\markboth{Left}{Source File: %s,  Date: %s}\n" % (file_basename, file_date))
     
-    # Define the dictionary of prologue processors.
-    prologue_processors = get_prologue_processors(opts)
-
-    # Get lang name
-    lang_name = get_language_info(lang,"lang")
-
-    # Process each line
-    for line in f:
-        raw_line = line.rstrip("\n").rstrip()  # Remove trailing newline characters and spaces
-        line   = raw_line.lstrip() # Remove leading spaces
-        fields = line.split(maxsplit=9999)  # Split the string into fields
-
-        # Determine marker index: if the line starts with the comment symbol, then marker is at index 1.
-        mi = 0
-        if fields and fields[0] == tokens["comment"]:
-            mi = 1
-
-        if len(fields) <= mi:
+    # Get lang name, and the opening of the minted blocks used in prologues
+    lang_name   = get_language_info(lang,"lang")
+    minted_open = f"\\begin{{minted}}[breaklines]{{{lang_name}}}"
+
+    # Define the dictionaries of marker, introduction and prologue processors.
+    marker_handlers     = get_marker_handlers(tokens, opts)
+    block_handlers      = get_block_handlers(tokens, opts, lang_name)
+    intro_processors    = get_intro_processors(opts)
+    prologue_processors = get_prologue_processors(opts, file_basename)
+    pre_intro_markers   = ("!QUOTE:", tokens["boi"])
+
+    # Marker scanner for the current language
+    match_marker = MARKER_RE[lang].match
+
+    # Bind tokens and options used in the loop to locals, which are cheaper to access.
+    tok_comment = tokens["comment"]
+    comment_len = len(tok_comment)
+    tok_eor     = tokens["eor"]
+    tok_eop     = tokens["eop"]
+    tok_eopi    = tokens["eopi"]
+    nolatex     = opts.nolatex
+    keys        = opts.keys
+    key_search  = compile_keys(tuple(keys)).search
+
+    # Process each line, reading the input in large batches of lines
+    for line in chain.from_iterable(iter(partial(f.readlines, READ_BUFFER_SIZE), [])):
+        raw_line = line.rstrip()   # Remove trailing newline characters and spaces
+        line     = raw_line.lstrip() # Remove leading spaces
+
+        # Skip blank lines and lines holding nothing but the comment symbol.
+        if not line or line == tok_comment:
             continue
 
+        # Determine the block marker (if any), optionally preceded by the comment symbol.
+        match = match_marker(line)
+        if match is None:
+            # -- Fast Path --
+            # Outside of prologues, introductions and resource blocks, a line without a
+            # marker cannot change the state: it is printed as-is inside a code block and
+            # dropped otherwise, so the dispatch below is skipped.
+            if not (state.resource or state.intro or state.prologue):
+                if state.source:
+                    emit(raw_line)
+                continue
+            marker = None
+        else:
+            marker = match.group(1)
+
         # -- Resource Block Processing --
         # If a resource block is active, process lines as resource items.
-        if state.get("resource", False):
-            if fields[mi] == tokens["eor"]:
-                state["resource"] = False
+        if state.resource:
+            if marker == tok_eor:
+                state.resource = False
             else:
                 process_resource_line(line)
             continue
 
-        # -- Process Global Markers (using fields[mi] for markers in non-prologue sections) --
-        # !QUOTE:
-        if fields[mi] == '!QUOTE:':
-            print(" ".join(fields[mi+1:]))
-            continue
-
-        #-------------------------------------------------------------#
-        # Introduction start: !BOI
-        if fields[mi] == tokens["boi"]:
-            state["intro"] = True
-            continue
-   
-        # Process Introduction Data using marker from fields[mi+1]
-        if state["intro"] and len(fields) > mi+1:
-            marker = fields[mi+1]
-            if marker == '!TITLE:':
-                if mi == 1: fields.pop(0)
-                fields.pop(0)
-                state["title"] = " ".join(fields)
-                state["tpage"] = True
-                continue
-            elif marker == '!AUTHORS:':
-                if mi == 1: fields.pop(0)
-                fields.pop(0)
-                state["author"] = " ".join(fields)
-                state["tpage"] = True
-                continue
-            elif marker == '!AFFILIATION:':
-                if mi == 1: fields.pop(0)
-                fields.pop(0)
-                state["affiliation"] = " ".join(fields)
-                state["tpage"] = True
-                continue
-            elif marker == '!DATE:':
-                if mi == 1: fields.pop(0)
-                fields.pop(0)
-                state["doc_date"] = " ".join(fields)
-                state["tpage"] = True
-                continue
-            elif marker == '!INTRODUCTION:':
-                do_beg(state, opts.bare)
-                print(" %..............................................")
-                if mi == 1: fields.pop(0)
-                fields.pop(0)
-                print("\\section{" + " ".join(fields) + "}")
+        # -- Introduction Data (!TITLE:, !AUTHORS:, ...) --
+        # The introduction marker is taken from fields[mi+1]. Only !QUOTE: and !BOI take
+        # precedence over it. Since it is one of the first three fields, the rest of the
+        # line is only split when a marker is found.
+        if state.intro and marker not in pre_intro_markers:
+            fields = line.split(None, 3)
+            mi     = 1 if fields[0] == tok_comment else 0
+            processor = intro_processors.get(fields[mi+1]) if len(fields) > mi+1 else None
+            if processor is not None:
+                processor(line.split(None, mi+1)[mi+1], state)
                 continue
 
-        if fields[mi] == tokens["eoi"]:
-            print("\n %/////////////////////////////////////////////////////////////")
-            print("\\newpage")
-            state["intro"] = False
-            continue
-        # Introduction end: !EOI
-        #-------------------------------------------------------------#
-
-
-        #-------------------------------------------------------------#
-        # -------------------- Start of Prologue -------------------- #
-        #-------------------------------------------------------------#
-
-        # Resourse start: !BOR
-        # Check resource block marker first
-        if fields[mi] == tokens["bor"]:
-            print("\\begin{center}")
-            print("{\\bf RESOURCES:}\\\\")
-            print("\\begin{tabular}{|l|l|l|l|}")
-            print("\\hline")
-            print("\\textbf{Name} & \\textbf{Description} & \\textbf{Units} & \\textbf{Default} \\\\")
-            print("\\hline")
-            print("\\end{tabular}")
-            print("\\end{center}")
-            state["resource"] = True
-            continue
-
-        # Prologue start: !BOP
-        if fields[mi] == tokens["bop"]:
-            if state["source"]:
-                do_eoc(state)
-                
-            do_beg(state, opts.bare)
-
-            if not state["first"]:
-                print("\n\\mbox{}\\hrulefill\\")
-            else:
-                if not opts.bare and not (opts.g or opts.M):
-                    print("\\section{Routine/Function Prologues} \\label{app:ProLogues}")
-
-            state["first"]    = False
-            state["prologue"] = True
-            state["verb"]     = False
-            state["source"]   = False
-            set_missing(state)
-            continue
-
-        if fields[mi] == tokens["bopi"]:
-            if opts.internal:
-                state["prologue"] = False
-            else:
-                if state["source"]:
-                    do_eoc(state)
-
-                do_beg(state, opts.bare)
-
-                if not state["first"]:
-                    print("\n\\mbox{}\\hrulefill\\")
-                else:
-                    if not opts.bare and not (opts.g or opts.M):
-                        print("\\section{Routine/Function Prologues} \\label{app:ProLogues}")
-
-                state["first"]    = False
-                state["prologue"] = True
-                state["verb"]     = False
-                state["source"]   = False
-                set_missing(state)
+        # -- Global Markers (!QUOTE:, !BOI, !EOI, !BOR, !BOP, !BOPI) --
+        handler = marker_handlers.get(marker)
+        if handler is not None:
+            handler(match.group(2), state)
             continue
 
         # For lines in a prologue, use the marker from fields[1] (if available)
         
         # Processing prologue markers in a generic way:
-        if state["prologue"]:
-            marker = fields[1] if len(fields) > 1 else fields[0]
-            if marker in prologue_processors:
-                if mi == 1:
-                    fields.pop(0)
-                fields.pop(0)
-                prologue_processors[marker](fields, file_basename, opts, state)
+        # Only the first two fields are needed to find the marker; the text after it is
+        # extracted only when a prologue processor actually fires.
+        if state.prologue:
+            fields = line.split(None, 2)
+            processor = prologue_processors.get(fields[1] if len(fields) > 1 else fields[0])
+            if processor is not None:
+                mi   = 1 if fields[0] == tok_comment else 0
+                rest = line.split(None, mi+1)
+                tail = rest[mi+1] if len(rest) > mi+1 else ""
+                processor(tail, file_basename, opts, state)
                 continue
 
             # New marker: resource blocks are processed outside of prologue below
-            # Process !DESCRIPTION:
-            if "!DESCRIPTION:" in line:
-                if state["verb"]:
-                    print("\\end{minted}")
-                    print("{\\sf DESCRIPTION:\\\\ }")
-                    print("")
-                    state["verb"] = False
-                if opts.nolatex:
-                    print(f"\\begin{{minted}}[breaklines]{{{lang_name}}}")
-                    state["verb"] = True
+            # Process !DESCRIPTION: (at the start of the line, or right after the comment symbol)
+            if line.startswith("!DESCRIPTION:") or (
+                    line.startswith(tok_comment) and line[comment_len:].lstrip().startswith("!DESCRIPTION:")):
+                if state.verb:
+                    emit("\\end{minted}")
+                    emit("{\\sf DESCRIPTION:\\\\ }")
+                    emit("")
+                    state.verb = False
+                if nolatex:
+                    emit(minted_open)
+                    state.verb = True
                 else:
-                    parts = line.split()
-                    start = 1 if parts[0] == '!' else 0
-                    print(" ".join(parts[start+1:]))
-                state["have_desc"] = True
+                    emit(line.partition("!DESCRIPTION:")[2].lstrip())
+                state.have_desc = True  # Record only (see DocState.RECORD_ONLY)
                 continue
-            # Process optional keywords
-            processed_key = False
-            for key in opts.keys:
-                if key in line:
-                    if state["verb"]:
-                        print("\\end{minted}")
-                        state["verb"] = False
-                    else:
-                        print("\n\\bigskip")
-                    label = key[1:]
-                    if any(x in line for x in ["USES", "INPUT", "OUTPUT", "PARAMETERS", "VALUE", "ARGUMENTS"]):
-                        print("{\\em " + label + "}")
-                    else:
-                        print("{\\sf " + label + "}")
-
-                    print(f"\\begin{{minted}}[breaklines]{{{lang_name}}}")
-                    state["verb"] = True
-                    processed_key = True
-                    break
-            if processed_key:
+            # Process optional keywords. The regex only tells whether the line holds any
+            # of them; the first one in the list is used, as before.
+            if key_search(line) is not None:
+                key = next(key for key in keys if key in line)
+                if state.verb:
+                    emit("\\end{minted}")
+                    state.verb = False
+                else:
+                    emit("\n\\bigskip")
+                label = key[1:]
+                if _LABEL_WORDS_RE.search(line) is not None:
+                    emit("{\\em " + label + "}")
+                else:
+                    emit("{\\sf " + label + "}")
+
+                emit(minted_open)
+                state.verb = True
                 continue
 
             # End of prologue markers !EOP or !EOPI:
-            if fields[mi] in (tokens["eop"], tokens["eopi"]):
-                if state["verb"]:
-                    print("\\end{minted}")
-                    state["verb"] = False
-                state["prologue"] = False
+            if marker == tok_eop or marker == tok_eopi:
+                do_eop(state)
                 continue
 
-        # -- Code Block --
-        if fields[mi] == tokens["boc"]:
-            if opts.s:
-                state['prologue'] = False
-            else:
-                do_boc(state, lang_name)
-            continue
-
-        if fields[mi] == tokens["eoc"]:
-            do_eoc(state)
-            continue
-
-        # -- Example Prologue --
-        if fields[mi] == tokens["boe"]:
-            if state["source"]:
-                do_eoc(state)
-
-            print("\n %/////////////////////////////////////////////////////////////")
-            state["first"]    = False
-            state["prologue"] = True
-            state["verb"]     = False
-            state["source"]   = False
-            continue
-
-        if fields[mi] == tokens["eoe"]:
-            if state["verb"]:
-                print("\\end{minted}")
-                state["verb"] = False
-
-            state["prologue"] = False
+        # -- Code Block and Example Prologue (!BOC, !EOC, !BOE, !EOE) --
+        handler = block_handlers.get(marker)
+        if handler is not None:
+            handler(state)
             continue
 
         # If in prologue or introduction, print the line (removing the initial comment symbol)
-        if state["prologue"] or state["intro"]:
-            if line.startswith(tokens["comment"]):
-                line = line[len(tokens["comment"]):]
-            print(line)
+        if state.prologue or state.intro:
+            if line.startswith(tok_comment):
+                line = line[comment_len:]
+            emit(line)
             continue
 
         # If in source code section, print the line as-is.
-        if state["source"]:
-            print(raw_line)
+        if state.source:
+            emit(raw_line)
             continue
 
     # End of file processing
-    print("")
-    if state["source"]:
+    emit("")
+    if state.source:
         do_eoc(state)
 
 
-def main():
-    """Main function that parses command-line arguments and generates the LaTeX documentation.
+#-------------------------------
+# Parallel processing of source files
+#-------------------------------
+def init_worker():
+    """Initializes a worker process, discarding any output inherited from the parent process."""
+    take_output()
 
-    Reads the command-line options, sets up the appropriate tokens based on the source language,
-    initializes the global state, and processes each file to generate LaTeX output.
+
+def render_file(filename, state, lang, opts):
+    """Processes a source file in a worker process and returns its LaTeX output.
+
+    Args:
+        filename (str): The name of the source file.
+        state (DocState): The document state before the file.
+        lang (str): Language code ('F' for Fortran90, 'A' for Ada, 'C' for C++, 'S' for Shell, G for GrADS)
+        opts (Namespace): Command-line options.
+
+    Returns:
+        tuple: The LaTeX output of the file (str) and the document state after it (DocState).
+    """
+    with open_source_file(filename) as f:
+        process_file(f, filename, state, get_language_tokens(lang), lang, opts)
+    return take_output(), state
+
+
+def process_files_parallel(files, state, lang, opts, jobs):
+    """Processes several source files with a pool of worker processes.
+
+    The document state is carried over from one file to the next, so the output of a file
+    depends on the files before it. The first file is processed here, and the others are
+    processed in parallel, each one starting from the state left by the first file. The
+    results are then written in order. When the actual starting state of a file differs
+    from that guess (e.g. because the first file only held the introduction), the file is
+    processed here with the right state, and the remaining files are submitted again
+    starting from the state it leaves, which becomes the new guess. The output is thus the
+    same as in a serial run. Only the attributes that affect the output are compared (see
+    `DocState.output_key`).
+
+    Args:
+        files (list of str): The names of the source files (standard input is not supported).
+        state (DocState): The document state before the first file.
+        lang (str): Language code ('F' for Fortran90, 'A' for Ada, 'C' for C++, 'S' for Shell, G for GrADS)
+        opts (Namespace): Command-line options.
+        jobs (int): Number of worker processes.
+
+    Returns:
+        DocState: The document state after the last file.
+    """
+    tokens = get_language_tokens(lang)
+    with open_source_file(files[0]) as f:
+        process_file(f, files[0], state, tokens, lang, opts)
+    flush_output()
+
+    pending = files[1:]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(pending)), initializer=init_worker) as executor:
+        while pending:
+            guess   = state.output_key()
+            futures = [executor.submit(render_file, filename, copy.copy(state), lang, opts)
+                       for filename in pending]
+
+            for i, (filename, future) in enumerate(zip(pending, futures)):
+                if state.output_key() != guess:
+                    # Wrong guess: the results of this file and the next ones are useless.
+                    for stale in futures[i:]:
+                        stale.cancel()
+                    with open_source_file(filename) as f:
+                        process_file(f, filename, state, tokens, lang, opts)
+                    flush_output()
+                    pending = pending[i+1:]
+                    break
+
+                text, end_state = future.result()
+                write_text(text)
+                state = end_state
+            else:
+                pending = []
+
+    return state
+
+
+# Default optional keyword markers (--keys). When a line holds several of them, the first
+# one in this order is used.
+_DEFAULT_KEYS = (
+    "!INTERFACE:", "!USES:", "!PUBLIC TYPES:", "!PRIVATE TYPES:",
+    "!PUBLIC MEMBER FUNCTIONS:", "!PRIVATE MEMBER FUNCTIONS:",
+    "!PUBLIC DATA MEMBERS:", "!PARAMETERS:", "!ARGUMENTS:",
+    "!DEFINED PARAMETERS:", "!INPUT PARAMETERS:", "!INPUT/OUTPUT PARAMETERS:",
+    "!OUTPUT PARAMETERS:", "!RETURN VALUE:", "!REVISION HISTORY:",
+    "!BUGS:", "!SEE ALSO:", "!SYSTEM ROUTINES:", "!FILES USED:",
+    "!REMARKS:", "!TO DO:", "!CALLING SEQUENCE:", "!AUTHOR:",
+    "!CALLED FROM:", "!LOCAL VARIABLES:"
+)
+
+
+@lru_cache(maxsize=None)
+def build_parser():
+    """Builds the command-line argument parser.
+
+    The parser is built once and cached, so that `main` can be called several times in
+    the same process (e.g. from a driver script) without rebuilding it. Arguments can also
+    be read from files given as '@file', one argument per line.
+
+    Returns:
+        argparse.ArgumentParser: The configured parser.
     """
     parser = argparse.ArgumentParser(
-        description="ProTeX - Processes Code Prologues into LaTeX (Python version)"
+        description="ProTeX - Processes Code Prologues into LaTeX (Python version)",
+        fromfile_prefix_chars="@"
     )
     parser.add_argument("files", nargs="*", help="Source files (use '-' for STDIN)")
     parser.add_argument("-b", "--bare", action="store_true", help="Bare mode: no preamble")
@@ -888,57 +1325,47 @@ def main():
     parser.add_argument("--x", dest="nolatex", action="store_true", help="No LaTeX mode (print !DESCRIPTION in verbatim)")
     parser.add_argument("--f", action="store_true", help="Do not display source file info")
     parser.add_argument("--i", dest="internal", action="store_true", help="Internal mode: omit prologues !BOPI/EOPI")
-    parser.add_argument("--keys", nargs="*", default=[
-        "!INTERFACE:", "!USES:", "!PUBLIC TYPES:", "!PRIVATE TYPES:",
-        "!PUBLIC MEMBER FUNCTIONS:", "!PRIVATE MEMBER FUNCTIONS:",
-        "!PUBLIC DATA MEMBERS:", "!PARAMETERS:", "!ARGUMENTS:",
-        "!DEFINED PARAMETERS:", "!INPUT PARAMETERS:", "!INPUT/OUTPUT PARAMETERS:",
-        "!OUTPUT PARAMETERS:", "!RETURN VALUE:", "!REVISION HISTORY:",
-        "!BUGS:", "!SEE ALSO:", "!SYSTEM ROUTINES:", "!FILES USED:",
-        "!REMARKS:", "!TO DO:", "!CALLING SEQUENCE:", "!AUTHOR:",
-        "!CALLED FROM:", "!LOCAL VARIABLES:"
-    ], help="List of optional keyword markers")
+    parser.add_argument("--keys", nargs="*", default=list(_DEFAULT_KEYS),
+                        help="List of optional keyword markers")
     parser.add_argument("--style", type=str, default=None,
                         help="Custom LaTeX document class or style to use (e.g., 'myStyle')")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Number of worker processes used when several files are given "
+                             "(default: 1, the files are processed serially; 0 uses the "
+                             "number of CPUs)")
 
     # Creating the argument parser dynamically based on the language_info dictionary
     for code, details in language_info.items():
         parser.add_argument(f"-{code}", action="store_true", help=f"{details['name']} code")
 
+    return parser
+
+
+def main(argv=None):
+    """Main function that parses command-line arguments and generates the LaTeX documentation.
+
+    Reads the command-line options, sets up the appropriate tokens based on the source language,
+    initializes the global state, and processes each file to generate LaTeX output.
+
+    Args:
+        argv (list of str, optional): The command-line arguments (default: `sys.argv[1:]`).
+    """
     # Parsing command-line arguments
-    opts = parser.parse_args()
+    opts = build_parser().parse_args(argv)
+
+    # Date stamp of this documentation pass, passed to the worker processes with the options
+    opts.run_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     # Determining the selected language
     lang = next((code for code in language_info if getattr(opts, code)), 'F')  # Default: Fortran
 
     tokens = get_language_tokens(lang)
-    global comment_string
-    comment_string = tokens["comment"]
 
     # Determine if GEOS/MAPL style is active
     is_mapl = opts.g or opts.M
 
     # Global state of the document
-    state = {
-        "intro":     False,
-        "prologue":  False,
-        "first":     True,
-        "source":    False,
-        "verb":      False,
-        "tpage":     False,
-        "begdoc":    False,
-        "not_first": False,
-        "have_name": False,
-        "have_desc": False,
-        "have_intf": False,
-        "have_hist": False,
-        "name_is":   "UNKNOWN",
-        "title": "",
-        "author": "",
-        "affiliation": "",
-        "doc_date": "",
-        "resource": False  # New flag for resource block
-    }
+    state = DocState()
 
     files = opts.files if opts.files else ['-']
 
@@ -946,16 +1373,24 @@ def main():
     if not opts.bare:
         print_preamble(opts.style)
     print_macros()
+    flush_output()
 
-    for filename in files:
-        if filename == '-' or filename == '':
-            process_file(sys.stdin, filename, state, tokens, lang, opts)
-        else:
-            with open(filename, 'r') as f:
-                process_file(f, filename, state, tokens, lang, opts)
+    # With --jobs, several files are processed in parallel, unless one of them is standard input.
+    jobs = opts.jobs or os.cpu_count() or 1
+    if jobs > 1 and len(files) > 2 and '-' not in files and '' not in files:
+        state = process_files_parallel(files, state, lang, opts, jobs)
+    else:
+        for filename in files:
+            if filename == '-' or filename == '':
+                process_file(open_stdin(), filename, state, tokens, lang, opts)
+            else:
+                with open_source_file(filename) as f:
+                    process_file(f, filename, state, tokens, lang, opts)
+            flush_output()
     
     if not opts.bare:
-        print("\\end{document}")
+        emit("\\end{document}")
+    flush_output()
 
 
 if __name__ == "__main__":